@@ -0,0 +1,318 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""C build of the minimum_vertex_cover branch-and-bound kernel.
+
+Build it in place with:
+
+    python setup_mvc_core.py build_ext --inplace
+
+minimum_vertex_cover imports this module when it has been built and falls
+back to its pure-Python kernels otherwise. The kernel mirrors
+_search_core_masks rule for rule -- incumbent bounds, degree-1 reductions,
+the skip-branch dominance check, the residual-state memo and the
+maximal-matching lower bound -- and it is a generator like the Python
+builds, so improving covers stream out as they are found. Picked sets live
+in fixed uint64[4] masks, so graphs of up to 256 vertices run entirely on
+native 64-bit ops; wider graphs stay on the Python big-int build.
+"""
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy, memset
+
+DEF MAX_WORDS = 4  # 4 x 64 bits: graphs up to 256 vertices
+
+
+cdef inline int _popcount64(uint64_t x):
+    x = x - ((x >> 1) & 0x5555555555555555ULL)
+    x = (x & 0x3333333333333333ULL) + ((x >> 2) & 0x3333333333333333ULL)
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0FULL
+    return <int>((x * 0x0101010101010101ULL) >> 56)
+
+
+cdef inline bint _test_bit(uint64_t* mask, long v):
+    return (mask[v >> 6] >> (v & 63)) & 1ULL
+
+
+cdef inline void _set_bit(uint64_t* mask, long v):
+    mask[v >> 6] |= 1ULL << (v & 63)
+
+
+cdef inline int _mask_popcount(uint64_t* mask):
+    cdef int total = 0
+    cdef long word
+    for word in range(MAX_WORDS):
+        total += _popcount64(mask[word])
+    return total
+
+
+cdef inline long _single_bit_index(uint64_t* mask):
+    """index of the lowest set bit; the callers only use it on masks they
+    have already checked to be non-empty"""
+    cdef long word
+    cdef uint64_t x
+    for word in range(MAX_WORDS):
+        x = mask[word]
+        if x:
+            return (word << 6) + _popcount64((x & (~x + 1ULL)) - 1ULL)
+    return -1
+
+
+def search_mvc(long[::1] indptr, long[::1] indices, double[::1] rank_weights,
+               long edge_count, double min_count, double min_weight_sum,
+               bint constant_weights=False):
+    """generator over the improving covers as (picked_mask, count,
+    weight_sum), same contract as the pure-Python kernels"""
+    cdef long n = indptr.shape[0] - 1
+    if n > 64 * MAX_WORDS:
+        raise ValueError("graph too large for the fixed-width mask kernel")
+
+    # every pop pushes at most two children, so the stack never outgrows
+    # one pending skip branch per depth plus the pick chain: 2n + 4 is safe
+    cdef long capacity = 2 * n + 4
+    cdef long* stack_rank = <long*>malloc(capacity * sizeof(long))
+    cdef long* stack_remaining = <long*>malloc(capacity * sizeof(long))
+    cdef long* stack_count = <long*>malloc(capacity * sizeof(long))
+    cdef double* stack_weight = <double*>malloc(capacity * sizeof(double))
+    cdef uint64_t* stack_mask = <uint64_t*>malloc(capacity * MAX_WORDS * sizeof(uint64_t))
+    # per-vertex neighbor masks, the uint64[4] mirror of _adj_masks
+    cdef uint64_t* adj_masks = <uint64_t*>malloc((n if n else 1) * MAX_WORDS * sizeof(uint64_t))
+    # scratch masks shared across iterations; a generator cannot keep C
+    # arrays on its (heap-allocated) frame, so these live off-frame too
+    cdef uint64_t* picked = <uint64_t*>malloc(8 * MAX_WORDS * sizeof(uint64_t))
+    if stack_rank == NULL or stack_remaining == NULL or stack_count == NULL \
+            or stack_weight == NULL or stack_mask == NULL \
+            or adj_masks == NULL or picked == NULL:
+        free(stack_rank); free(stack_remaining); free(stack_count)
+        free(stack_weight); free(stack_mask); free(adj_masks); free(picked)
+        raise MemoryError()
+    cdef uint64_t* alive = picked + MAX_WORDS
+    cdef uint64_t* leaf_adj = picked + 2 * MAX_WORDS
+    cdef uint64_t* effective = picked + 3 * MAX_WORDS
+    cdef uint64_t* unmatched = picked + 4 * MAX_WORDS
+    cdef uint64_t* closed = picked + 5 * MAX_WORDS
+    cdef uint64_t* scratch = picked + 6 * MAX_WORDS
+    cdef uint64_t* all_mask = picked + 7 * MAX_WORDS
+
+    cdef long top = 0
+    cdef long rank, remaining_edges, count
+    cdef double weight_sum
+    cdef long u, v, k, word
+    cdef long matching_size, alive_degree
+    cdef double matching_weight
+    cdef bint reduced, infeasible, changed, skip_dominated
+    cdef object py_mask, cached
+    cdef long cached_count
+    cdef double cached_sum
+    # dominance memo, same policy as _search_core_masks: keyed by the
+    # decision index plus the set of vertices that still have uncovered
+    # edges, capped rather than evicted, self-disabling when it barely hits
+    memo = {}
+    cdef long memo_lookups = 0
+    cdef long memo_hits = 0
+
+    try:
+        memset(adj_masks, 0, (n if n else 1) * MAX_WORDS * sizeof(uint64_t))
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                _set_bit(adj_masks + u * MAX_WORDS, indices[k])
+        memset(all_mask, 0, MAX_WORDS * sizeof(uint64_t))
+        for u in range(n):
+            _set_bit(all_mask, u)
+
+        stack_rank[0] = 0
+        stack_remaining[0] = edge_count
+        stack_count[0] = 0
+        stack_weight[0] = 0.0
+        memset(stack_mask, 0, MAX_WORDS * sizeof(uint64_t))
+        top = 1
+
+        while top:
+            top -= 1
+            rank = stack_rank[top]
+            remaining_edges = stack_remaining[top]
+            count = stack_count[top]
+            weight_sum = stack_weight[top]
+            memcpy(picked, stack_mask + top * MAX_WORDS, MAX_WORDS * sizeof(uint64_t))
+
+            if count > min_count:
+                # not optimal even if we choose not to pick at later decisions
+                continue
+            if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+                continue
+            if remaining_edges == 0:
+                # every edge is covered: we got a solution
+                py_mask = 0
+                for word in range(MAX_WORDS):
+                    py_mask = py_mask | (int(picked[word]) << (64 * word))
+                yield py_mask, count, weight_sum
+                min_weight_sum = weight_sum
+                min_count = count
+                continue
+            if rank >= n:
+                # we can't find a solution, all index used.
+                continue
+
+            for word in range(MAX_WORDS):
+                alive[word] = all_mask[word] & ~picked[word]
+
+            # degree-1 reduction, as in _search_core_masks: when a vertex's
+            # only alive neighbor is u, picking u dominates picking the leaf
+            # (weight-guarded), and an uncoverable leaf edge kills the branch
+            reduced = False
+            infeasible = False
+            changed = True
+            while changed and not infeasible:
+                changed = False
+                for v in range(n):
+                    if not _test_bit(alive, v):
+                        continue
+                    for word in range(MAX_WORDS):
+                        leaf_adj[word] = adj_masks[v * MAX_WORDS + word] & alive[word]
+                    if _mask_popcount(leaf_adj) != 1:
+                        continue  # degree 0 or degree >= 2: nothing forced
+                    u = _single_bit_index(leaf_adj)
+                    if u < rank:
+                        if v < rank:
+                            # both endpoints' turns have passed: this edge can
+                            # never be covered, the whole branch is dead
+                            infeasible = True
+                            break
+                        # only the leaf itself is still pickable; leave that
+                        # to the normal branching at its turn
+                        continue
+                    if v >= rank and not constant_weights and rank_weights[u] > rank_weights[v]:
+                        continue  # picking the lighter leaf might win on weight
+                    for word in range(MAX_WORDS):
+                        scratch[word] = adj_masks[u * MAX_WORDS + word] & alive[word]
+                    remaining_edges -= _mask_popcount(scratch)
+                    _set_bit(picked, u)
+                    count += 1
+                    weight_sum += rank_weights[u]
+                    for word in range(MAX_WORDS):
+                        alive[word] = all_mask[word] & ~picked[word]
+                    changed = True
+                    reduced = True
+            if infeasible:
+                continue
+            if reduced:
+                # the forced picks changed the totals, so re-run the bound
+                # and leaf checks before going on to branch
+                if count > min_count:
+                    continue
+                if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+                    continue
+                if remaining_edges == 0:
+                    py_mask = 0
+                    for word in range(MAX_WORDS):
+                        py_mask = py_mask | (int(picked[word]) << (64 * word))
+                    yield py_mask, count, weight_sum
+                    min_weight_sum = weight_sum
+                    min_count = count
+                    continue
+
+            if memo is not None:
+                memset(effective, 0, MAX_WORDS * sizeof(uint64_t))
+                for u in range(n):
+                    if not _test_bit(alive, u):
+                        continue
+                    for word in range(MAX_WORDS):
+                        scratch[word] = adj_masks[u * MAX_WORDS + word] & alive[word]
+                    if _mask_popcount(scratch):
+                        _set_bit(effective, u)
+                key = (rank, effective[0], effective[1], effective[2], effective[3])
+                memo_lookups += 1
+                cached = memo.get(key)
+                if cached is not None:
+                    memo_hits += 1
+                    cached_count, cached_sum = cached
+                    if cached_count <= count and cached_sum <= weight_sum:
+                        # the first visit reached this residual graph at least
+                        # as cheaply: nothing down here beats its sweep
+                        continue
+                    if count <= cached_count and weight_sum <= cached_sum:
+                        memo[key] = (count, weight_sum)
+                elif len(memo) < 1 << 18:  # stop inserting rather than evicting once full
+                    memo[key] = (count, weight_sum)
+                if memo_lookups == 4096 and memo_hits * 100 < memo_lookups:
+                    memo = None  # hit rate below 1%: the dict is pure overhead here
+
+            # matching lower bound: pair off uncovered edges greedily, lowest
+            # rank first, same edge order as the bitmask kernel
+            memcpy(unmatched, alive, MAX_WORDS * sizeof(uint64_t))
+            matching_size = 0
+            matching_weight = 0.0
+            for u in range(n):
+                if not _test_bit(unmatched, u):
+                    continue
+                for word in range(MAX_WORDS):
+                    scratch[word] = adj_masks[u * MAX_WORDS + word] & unmatched[word]
+                if _mask_popcount(scratch):
+                    v = _single_bit_index(scratch)
+                    unmatched[u >> 6] &= ~(1ULL << (u & 63))
+                    unmatched[v >> 6] &= ~(1ULL << (v & 63))
+                    matching_size += 1
+                    if not constant_weights:
+                        if rank_weights[u] < rank_weights[v]:
+                            matching_weight += rank_weights[u]
+                        else:
+                            matching_weight += rank_weights[v]
+            if count + matching_size > min_count:
+                continue
+            if count + matching_size == min_count and (
+                    constant_weights or weight_sum + matching_weight >= min_weight_sum):
+                continue
+
+            if _test_bit(picked, rank):
+                # the current vertex was force-picked by a reduction: there
+                # is no decision left here, just advance to the next index
+                stack_rank[top] = rank + 1
+                stack_remaining[top] = remaining_edges
+                stack_count[top] = count
+                stack_weight[top] = weight_sum
+                memcpy(stack_mask + top * MAX_WORDS, picked, MAX_WORDS * sizeof(uint64_t))
+                top += 1
+                continue
+
+            for word in range(MAX_WORDS):
+                closed[word] = adj_masks[rank * MAX_WORDS + word] & alive[word]
+            alive_degree = _mask_popcount(closed)
+            # dominance: if some alive neighbor u has all of its alive
+            # neighbors inside this vertex's closed neighborhood, swapping u
+            # for this vertex makes any skip-branch cover no larger (and,
+            # weight-guarded, no heavier), so the skip branch cannot win
+            skip_dominated = False
+            if alive_degree:
+                _set_bit(closed, rank)
+                for u in range(n):
+                    if u == rank or not _test_bit(closed, u):
+                        continue
+                    if not constant_weights and rank_weights[rank] > rank_weights[u]:
+                        continue  # swapping u for this vertex could gain weight
+                    for word in range(MAX_WORDS):
+                        scratch[word] = adj_masks[u * MAX_WORDS + word] & alive[word] & ~closed[word]
+                    if _mask_popcount(scratch) == 0:
+                        skip_dominated = True
+                        break
+            # skip branch below the pick branch, as in _search_core
+            if not skip_dominated:
+                stack_rank[top] = rank + 1
+                stack_remaining[top] = remaining_edges
+                stack_count[top] = count
+                stack_weight[top] = weight_sum
+                memcpy(stack_mask + top * MAX_WORDS, picked, MAX_WORDS * sizeof(uint64_t))
+                top += 1
+            if alive_degree:  # node still has uncovered edges
+                _set_bit(picked, rank)
+                stack_rank[top] = rank + 1
+                stack_remaining[top] = remaining_edges - alive_degree
+                stack_count[top] = count + 1
+                stack_weight[top] = weight_sum + rank_weights[rank]
+                memcpy(stack_mask + top * MAX_WORDS, picked, MAX_WORDS * sizeof(uint64_t))
+                top += 1
+    finally:
+        free(stack_rank)
+        free(stack_remaining)
+        free(stack_count)
+        free(stack_weight)
+        free(stack_mask)
+        free(adj_masks)
+        free(picked)
@@ -1,25 +1,56 @@
+from array import array
 from collections import defaultdict, OrderedDict
 from numbers import Real
+from typing import Iterable, Tuple
 
-def find_connected_components(adj_table):
+def find_connected_components(adj_table, node_to_id=None):
     """
     Find connected components in a graph represented as an adjacency table
     adj_table: dict where keys are nodes and values are lists of neighbors
+    node_to_id: optional mapping of every node to a dense int in
+        range(len(adj_table)); built on the fly when absent. the dense ids
+        let visited be a flat bytearray, so the membership check is a single
+        byte load instead of hashing into a set (which also costs ~50 bytes
+        per entry). nodes that only ever appear inside a neighbor list (the
+        table need not be symmetric) get their ids assigned lazily
     """
-    visited = set()
-    components = []
-    
-    def dfs(node, component):
-        visited.add(node)
-        component.append(node)
-        for neighbor in adj_table.get(node, []):
-            if neighbor not in visited:
-                dfs(neighbor, component)
-    
+    if node_to_id is None:
+        node_to_id = {node: i for i, node in enumerate(adj_table)}
+    id_to_node = [None] * len(node_to_id)
+    for node, node_id in node_to_id.items():
+        id_to_node[node_id] = node
+    visited = bytearray(len(node_to_id))
+
+    def id_of(node):
+        # a neighbor missing from the keys still needs a dense id: hand one
+        # out on first sight and grow the side tables to match
+        node_id = node_to_id.setdefault(node, len(node_to_id))
+        if node_id == len(id_to_node):
+            id_to_node.append(node)
+            visited.append(0)
+        return node_id
+
+    def dfs(start_id, component):
+        # explicit stack: recursing per node would hit the recursion limit on
+        # long chains and pays a Python call frame per node. neighbors are
+        # pushed reversed so pop order matches the old recursive visit order.
+        stack = [start_id]
+        while stack:
+            node_id = stack.pop()
+            if visited[node_id]:
+                continue
+            visited[node_id] = 1
+            node = id_to_node[node_id]
+            component.append(node)
+            for neighbor in reversed(adj_table.get(node, [])):
+                neighbor_id = id_of(neighbor)
+                if not visited[neighbor_id]:
+                    stack.append(neighbor_id)
+
     for node in adj_table:
-        if node not in visited:
+        if not visited[node_to_id[node]]:
             component = []
-            dfs(node, component)
+            dfs(node_to_id[node], component)
             yield component
 
 def create_graph_max_degree_first_then_min_weight_first(
@@ -36,30 +67,391 @@ def create_graph_max_degree_first_then_min_weight_first(
     node_indexes = list(graph.keys())
     node_indexes.sort(key=lambda i: (-graph_degrees[i], nodes_weight_func(nodes[i])))
     node_index_rank = {x:i for i,x in enumerate(node_indexes)}
+    # one bound method shared by every row instead of a fresh lambda (and its
+    # closure) per row; the key call is a plain dict lookup either way, but
+    # without the extra Python frame the lambda indirection costs
+    rank_of = node_index_rank.__getitem__
     result = OrderedDict()
     for i in node_indexes:
-        result[i] = list(sorted(graph[i], key=lambda x: node_index_rank[x]))
+        result[i] = sorted(graph[i], key=rank_of)
     return result
 
 def delete_node(graph, node):
     """Return a new graph with the specified node deleted"""
-    # Create a new graph without the node
-    new_graph = OrderedDict()
-    
-    for current_node, neighbors in graph.items():
-        if current_node == node:
-            continue  # Skip the node to be deleted
-        
-        # Create new neighbor list excluding the deleted node
-        new_neighbors = [neighbor for neighbor in neighbors if neighbor != node]
+    # copy the dict in one C-level call and fix up only the deleted node's
+    # neighbors: everyone else's list is unchanged, so scanning the whole
+    # graph to skip one key was O(V+E) of wasted comparisons
+    new_graph = OrderedDict(graph)
+    neighbors_of_deleted = new_graph.pop(node, ())
+    for neighbor in neighbors_of_deleted:
+        neighbors = new_graph.get(neighbor)
+        if neighbors is None:
+            continue
+        new_neighbors = [current for current in neighbors if current != node]
         if new_neighbors:
-            new_graph[current_node] = new_neighbors
-    
+            new_graph[neighbor] = new_neighbors
+        else:
+            # nodes with no edges left drop out of the graph entirely
+            del new_graph[neighbor]
     return new_graph
 
 def constant(x):
     return 1
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel below runs as plain Python without it
+    njit = None
+
+try:
+    import _mvc_core  # C build of the kernel, made with setup_mvc_core.py
+except ImportError:  # optional, like numba: the Python kernels cover everything
+    _mvc_core = None
+
+def _search_core(indptr, indices, rank_weights, edge_count, min_count, min_weight_sum, constant_weights=False):
+    """iterative branch-and-bound kernel over the CSR adjacency.
+
+    module level and free of Python object state on purpose: it only touches
+    flat int arrays and scalars, so numba.njit (which supports generator
+    functions) compiles it unchanged when numba is installed. yields
+    (picked_mask, count, weight_sum) for every improving cover. each stack
+    entry carries its complete state; masks are immutable ints, so branching
+    needs no undo bookkeeping. carries the same degree-1 reduction and
+    skip-branch dominance rules as _search_core_masks; only the residual
+    memo stays exclusive to the bitmask and C builds (a dict does not njit).
+    """
+    n = len(indptr) - 1
+    initial_weight = rank_weights[0] * 0 if n else 0  # typed zero keeps the stack tuples homogeneous for numba
+    stack = [(0, 0, edge_count, 0, initial_weight)]
+    while stack:
+        rank, picked_mask, remaining_edges, count, weight_sum = stack.pop()
+        if count > min_count:
+            # not optimal even if we choose not to pick at later decisions
+            continue
+        if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+            # with constant weights the sum equals the count, so equal count
+            # already means no improvement and the weight compare is skipped
+            continue
+        if remaining_edges == 0:
+            # every edge is covered: we got a solution
+            yield picked_mask, count, weight_sum
+            min_weight_sum = weight_sum
+            min_count = count
+            continue
+        if rank >= n:
+            # we can't find a solution, all index used.
+            continue
+
+        # reduction, as in _search_core_masks: when a vertex's only alive
+        # neighbor is u, that edge must be covered, and picking u dominates
+        # picking the leaf (weight-guarded with real weights). repeat until
+        # no forced move is left.
+        reduced = False
+        infeasible = False
+        changed = True
+        while changed and not infeasible:
+            changed = False
+            for v in range(n):
+                if (picked_mask >> v) & 1:
+                    continue
+                leaf_degree = 0
+                u = -1
+                for k in range(indptr[v], indptr[v + 1]):
+                    w = indices[k]
+                    if not (picked_mask >> w) & 1:
+                        leaf_degree += 1
+                        u = w
+                        if leaf_degree > 1:
+                            break
+                if leaf_degree != 1:
+                    continue  # degree 0 or degree >= 2: nothing forced
+                if u < rank:
+                    if v < rank:
+                        # both endpoints' turns have passed: this edge can
+                        # never be covered, the whole branch is dead
+                        infeasible = True
+                        break
+                    # only the leaf itself is still pickable; leave that to
+                    # the normal branching at its turn
+                    continue
+                if v >= rank and not constant_weights and rank_weights[u] > rank_weights[v]:
+                    continue  # picking the lighter leaf might win on weight
+                for k in range(indptr[u], indptr[u + 1]):
+                    if not (picked_mask >> indices[k]) & 1:
+                        remaining_edges -= 1
+                picked_mask |= 1 << u
+                count += 1
+                weight_sum += rank_weights[u]
+                changed = True
+                reduced = True
+        if infeasible:
+            continue
+        if reduced:
+            # the forced picks changed the totals, so re-run the bound and
+            # leaf checks before going on to branch
+            if count > min_count:
+                continue
+            if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+                continue
+            if remaining_edges == 0:
+                yield picked_mask, count, weight_sum
+                min_weight_sum = weight_sum
+                min_count = count
+                continue
+
+        # lower bound: greedily build a maximal matching on the uncovered
+        # edges. any cover must still pick one endpoint per matching edge
+        # (paying at least the lighter endpoint), so subtrees that cannot
+        # beat the incumbent are cut here instead of much deeper.
+        matched_mask = picked_mask  # picked nodes count as unavailable for matching
+        matching_size = 0
+        matching_weight = initial_weight
+        for u in range(n):
+            if (matched_mask >> u) & 1:
+                continue
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if not (matched_mask >> v) & 1:
+                    matched_mask |= (1 << u) | (1 << v)
+                    matching_size += 1
+                    if not constant_weights:
+                        if rank_weights[u] < rank_weights[v]:
+                            matching_weight += rank_weights[u]
+                        else:
+                            matching_weight += rank_weights[v]
+                    break
+        if count + matching_size > min_count:
+            continue
+        if count + matching_size == min_count and (constant_weights or weight_sum + matching_weight >= min_weight_sum):
+            continue
+
+        if (picked_mask >> rank) & 1:
+            # the current vertex was force-picked by a reduction: there is no
+            # decision left here, just advance to the next index
+            stack.append((rank + 1, picked_mask, remaining_edges, count, weight_sum))
+            continue
+
+        alive_degree = 0
+        neighborhood = 0
+        for k in range(indptr[rank], indptr[rank + 1]):
+            w = indices[k]
+            if not (picked_mask >> w) & 1:
+                alive_degree += 1
+                neighborhood |= 1 << w
+        # dominance, as in _search_core_masks: if some alive neighbor u has
+        # all of its alive neighbors inside this vertex's closed
+        # neighborhood, swapping u for this vertex makes any skip-branch
+        # cover no larger (weight-guarded, no heavier), so skipping cannot win
+        skip_dominated = False
+        if alive_degree:
+            closed_neighborhood = neighborhood | (1 << rank)
+            for k in range(indptr[rank], indptr[rank + 1]):
+                u = indices[k]
+                if (picked_mask >> u) & 1:
+                    continue
+                if not constant_weights and rank_weights[rank] > rank_weights[u]:
+                    continue  # swapping u for this vertex could gain weight
+                dominating = True
+                for j in range(indptr[u], indptr[u + 1]):
+                    w = indices[j]
+                    if not (picked_mask >> w) & 1 and not (closed_neighborhood >> w) & 1:
+                        dominating = False
+                        break
+                if dominating:
+                    skip_dominated = True
+                    break
+        # push the skip branch first so the pick branch sits on top of the
+        # stack and its whole subtree is explored before skipping, keeping
+        # the original DFS order (picking first reaches good covers quickly)
+        if not skip_dominated:
+            stack.append((rank + 1, picked_mask, remaining_edges, count, weight_sum))
+        if alive_degree:  # node still has uncovered edges
+            stack.append((rank + 1, picked_mask | (1 << rank), remaining_edges - alive_degree,
+                          count + 1, weight_sum + rank_weights[rank]))
+
+_search_core_jit = njit(cache=True, nogil=True)(_search_core) if njit is not None else None
+
+def _search_core_masks(adj_masks, rank_weights, edge_count, min_count, min_weight_sum, constant_weights=False):
+    """bitmask build of the _search_core kernel: each vertex's neighbor set is
+    a single int bitmask, so the alive-degree check and the matching lower
+    bound collapse into AND + popcount instead of CSR scans. for graphs of up
+    to 64 vertices every mask is one machine word and int.bit_count() maps to
+    a single POPCNT instruction; wider graphs still work through Python's big
+    ints, just without the one-word fast path.
+    """
+    n = len(adj_masks)
+    all_mask = (1 << n) - 1
+    initial_weight = rank_weights[0] * 0 if n else 0
+    # dominance memo: the residual problem is fully determined by the decision
+    # index plus the set of vertices that still have uncovered edges (isolated
+    # vertices can never be picked, so they don't matter). a revisit that is
+    # no cheaper on both count and weight cannot beat what the first visit
+    # already explored. instances without such symmetry would only pay dict
+    # overhead, so the memo disables itself when it barely hits.
+    memo = {}
+    memo_lookups = 0
+    memo_hits = 0
+    stack = [(0, 0, edge_count, 0, initial_weight)]
+    while stack:
+        rank, picked_mask, remaining_edges, count, weight_sum = stack.pop()
+        if count > min_count:
+            # not optimal even if we choose not to pick at later decisions
+            continue
+        if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+            # with constant weights the sum equals the count, so equal count
+            # already means no improvement and the weight compare is skipped
+            continue
+        if remaining_edges == 0:
+            # every edge is covered: we got a solution
+            yield picked_mask, count, weight_sum
+            min_weight_sum = weight_sum
+            min_count = count
+            continue
+        if rank >= n:
+            # we can't find a solution, all index used.
+            continue
+
+        # reduction: when a vertex's only alive neighbor is u, that edge must
+        # be covered, and picking u dominates picking the leaf (u covers a
+        # superset of its edges; with real weights only when u is no
+        # heavier). degree-0 vertices need no rule: the branch step below
+        # never picks a vertex without alive edges. repeat until no forced
+        # move is left.
+        alive = all_mask & ~picked_mask
+        reduced = False
+        infeasible = False
+        changed = True
+        while changed and not infeasible:
+            changed = False
+            probe = alive
+            while probe:
+                v_bit = probe & -probe
+                probe &= probe - 1
+                if not (v_bit & alive):
+                    continue  # force-picked by an earlier round
+                leaf_adj = adj_masks[v_bit.bit_length() - 1] & alive
+                if leaf_adj == 0 or leaf_adj & (leaf_adj - 1):
+                    continue  # degree 0 or degree >= 2: nothing forced
+                u = leaf_adj.bit_length() - 1
+                v = v_bit.bit_length() - 1
+                if u < rank:
+                    if v < rank:
+                        # both endpoints' turns have passed: this edge can
+                        # never be covered, the whole branch is dead
+                        infeasible = True
+                        break
+                    # only the leaf itself is still pickable; leave that to
+                    # the normal branching at its turn
+                    continue
+                if v >= rank and not constant_weights and rank_weights[u] > rank_weights[v]:
+                    continue  # picking the lighter leaf might win on weight
+                remaining_edges -= (adj_masks[u] & alive).bit_count()
+                picked_mask |= leaf_adj
+                count += 1
+                weight_sum += rank_weights[u]
+                alive = all_mask & ~picked_mask
+                changed = True
+                reduced = True
+        if infeasible:
+            continue
+        if reduced:
+            # the forced picks changed the totals, so re-run the bound and
+            # leaf checks before going on to branch
+            if count > min_count:
+                continue
+            if count == min_count and (constant_weights or weight_sum >= min_weight_sum):
+                continue
+            if remaining_edges == 0:
+                yield picked_mask, count, weight_sum
+                min_weight_sum = weight_sum
+                min_count = count
+                continue
+
+        if memo is not None:
+            effective = 0
+            probe = alive
+            while probe:
+                u_bit = probe & -probe
+                probe &= probe - 1
+                if adj_masks[u_bit.bit_length() - 1] & alive:
+                    effective |= u_bit
+            key = (rank, effective)
+            memo_lookups += 1
+            cached = memo.get(key)
+            if cached is not None:
+                memo_hits += 1
+                cached_count, cached_sum = cached
+                if cached_count <= count and cached_sum <= weight_sum:
+                    # the first visit reached this residual graph at least as
+                    # cheaply, so nothing down here can improve on its sweep
+                    continue
+                if count <= cached_count and weight_sum <= cached_sum:
+                    memo[key] = (count, weight_sum)
+            elif len(memo) < 1 << 18:  # stop inserting rather than evicting once full
+                memo[key] = (count, weight_sum)
+            if memo_lookups == 4096 and memo_hits * 100 < memo_lookups:
+                memo = None  # hit rate below 1%: the dict is pure overhead here
+
+        # matching lower bound (see _search_core): pair off uncovered edges
+        # greedily, lowest rank first, same edge order as the CSR scan
+        unmatched = alive
+        remaining = alive
+        matching_size = 0
+        matching_weight = initial_weight
+        while remaining:
+            u_bit = remaining & -remaining
+            remaining &= remaining - 1
+            if not (unmatched & u_bit):
+                continue
+            u = u_bit.bit_length() - 1
+            partners = adj_masks[u] & unmatched
+            if partners:
+                v_bit = partners & -partners
+                unmatched &= ~(u_bit | v_bit)
+                matching_size += 1
+                if not constant_weights:
+                    v = v_bit.bit_length() - 1
+                    if rank_weights[u] < rank_weights[v]:
+                        matching_weight += rank_weights[u]
+                    else:
+                        matching_weight += rank_weights[v]
+        if count + matching_size > min_count:
+            continue
+        if count + matching_size == min_count and (constant_weights or weight_sum + matching_weight >= min_weight_sum):
+            continue
+
+        if (picked_mask >> rank) & 1:
+            # the current vertex was force-picked by a reduction: there is no
+            # decision left here, just advance to the next index
+            stack.append((rank + 1, picked_mask, remaining_edges, count, weight_sum))
+            continue
+
+        neighborhood = adj_masks[rank] & alive
+        alive_degree = neighborhood.bit_count()
+        # dominance: if some alive neighbor u has all of its alive neighbors
+        # inside this vertex's closed neighborhood, then any cover without
+        # this vertex contains u and all its neighbors, and swapping u for
+        # this vertex gives a cover that is no larger (and, weight-guarded,
+        # no heavier) -- so the skip branch cannot beat the pick branch
+        skip_dominated = False
+        if alive_degree:
+            closed_neighborhood = neighborhood | (1 << rank)
+            candidates = neighborhood
+            while candidates:
+                u_bit = candidates & -candidates
+                candidates &= candidates - 1
+                if not constant_weights and rank_weights[rank] > rank_weights[u_bit.bit_length() - 1]:
+                    continue  # swapping u for this vertex could gain weight
+                if adj_masks[u_bit.bit_length() - 1] & alive & ~closed_neighborhood == 0:
+                    skip_dominated = True
+                    break
+        # skip branch below the pick branch, as in _search_core
+        if not skip_dominated:
+            stack.append((rank + 1, picked_mask, remaining_edges, count, weight_sum))
+        if alive_degree:  # node still has uncovered edges
+            stack.append((rank + 1, picked_mask | (1 << rank), remaining_edges - alive_degree,
+                          count + 1, weight_sum + rank_weights[rank]))
+
 class MinimalVertexCoverSearcher:
     """
     search minimal vertex cover progressively. yield solutions while trying to minimize tuple (count, weight_sum). 
@@ -74,7 +466,14 @@ class MinimalVertexCoverSearcher:
         self.original_graph = None
         self.search_order = None
         self.nodes_weight_func = constant
-    
+        self._weight_is_constant = True
+        self._weights = None
+        self._rank_weights = None
+        self._indptr = None
+        self._indices = None
+        self._adj_masks = None
+        self._edge_count = 0
+
     def __init__(self, quiet=False):
         self.init()
         self.quiet = quiet
@@ -83,49 +482,160 @@ class MinimalVertexCoverSearcher:
         self.init()
         self.original_nodes = nodes
         self.original_graph = create_graph_max_degree_first_then_min_weight_first(nodes, edges, nodes_weight_func)
-        self.search_order = list(self.original_graph)#{x:i for i,x in enumerate(self.original_graph))
         if not self.quiet:
             assert len(self.original_graph) == len(nodes), "you must include all nodes in the edge. otherwise, it is impossible to do vertex cover. "
-            components = find_connected_components(adj_table=self.original_graph)
-            print("component 1", next(components)) # TODO: remove debugging print
-            try:
-                print("component 2", next(components)) # TODO: remove debugging print
-                raise ValueError("multiple connected components detected. You may want to split them using find_connected_components and run search individially. ")
-            except StopIteration:
-                pass # should not have second components in the graph
         self.nodes_weight_func = nodes_weight_func
-        yield from self._search_streamed(0, [], self.original_graph)
-    
-    def _search_streamed(self, current_decision_index, selected_solution, current_graph):
-        # print("current searching status", locals()) # TODO: remove debugging code
-        current_count = len(selected_solution)  
-        current_sum = sum(self.nodes_weight_func(self.original_nodes[i]) for i in selected_solution) 
-        
-        if current_count > self.current_min_count: 
-            # print("(partial) solution", selected_solution, f"use {current_count} more than", self.current_min_count, "nodes")
-            # not optimal even if we choose not to pick at later decisions
+        # the default weighting makes weight_sum == count, so the kernels can
+        # drop their whole weight path for the overwhelmingly common call
+        self._weight_is_constant = nodes_weight_func is constant
+        components = list(find_connected_components(adj_table=self.original_graph))
+        if len(components) > 1:
+            # components never share edges, so their covers are independent:
+            # solving them jointly multiplies the search spaces while solving
+            # them one by one only adds them up
+            yield from self._search_components_streamed(nodes, components, nodes_weight_func)
             return
+        self.search_order = list(self.original_graph)#{x:i for i,x in enumerate(self.original_graph))
+        self._weights = [nodes_weight_func(node) for node in nodes]  # cache so the hot loop does a list index, not a function call
+        # relabel nodes to their dense rank (= position in search_order) once
+        # and lay the adjacency out in CSR form: neighbors of rank r live in
+        # _indices[_indptr[r]:_indptr[r+1]]. two flat int arrays mean one
+        # contiguous block instead of a pointer chase per neighbor, and no
+        # graph dict copying on delete (a removed bitmask handles that)
+        node_rank = {node: rank for rank, node in enumerate(self.search_order)}
+        indptr = array('l', [0])
+        indices = array('l')
+        for node in self.search_order:
+            for neighbor in self.original_graph[node]:
+                indices.append(node_rank[neighbor])
+            indptr.append(len(indices))
+        self._indptr = indptr
+        self._indices = indices
+        self._rank_weights = [self._weights[node] for node in self.search_order]
+        # per-vertex neighbor bitmasks for the popcount-based kernel build
+        self._adj_masks = [sum(1 << indices[k] for k in range(indptr[rank], indptr[rank + 1]))
+                           for rank in range(len(self.search_order))]
+        self._edge_count = len(indices) // 2
+        if self._edge_count:
+            # seed the bounds with a quick greedy cover so pruning fires from
+            # the very first decision instead of only after the first full leaf
+            greedy_solution, greedy_count, greedy_sum = self._greedy_cover()
+            yield greedy_solution, greedy_count, greedy_sum
+            self.current_min_count = greedy_count
+            self.current_min_weight_sum = greedy_sum
+            self.current_solution = list(greedy_solution)
+        yield from self._search_streamed()
 
-        if current_count == self.current_min_count and current_sum >= self.current_min_weight_sum: 
-            # print("(partial) solution", selected_solution, f"use {current_sum} more than", self.current_min_weight_sum)
-            # not optimal even if we choose not to pick at later decisions
-            return
-        
-        if len(current_graph) == 0:
-            # we got a solution
-            yield selected_solution, current_count, current_sum
+    def _search_components_streamed(self, nodes, components, nodes_weight_func):
+        """solve each connected component with its own sub-searcher and stream
+        the concatenated covers. the first yield combines the per-component
+        greedy solutions; every later yield replays one component's improved
+        solution, so the combined stream still strictly improves"""
+        streams = []
+        for component in components:
+            component_edges = [(node, neighbor)
+                               for node in component
+                               for neighbor in self.original_graph[node]
+                               if node <= neighbor]
+            sub_searcher = MinimalVertexCoverSearcher(quiet=True)
+            streams.append(sub_searcher.search_streamed(nodes, component_edges, nodes_weight_func))
+        # every component has at least one edge, so each stream yields its
+        # greedy cover immediately
+        bests = [next(stream) for stream in streams]
+
+        def combined():
+            solution = []
+            for best_solution, _, _ in bests:
+                solution.extend(best_solution)
+            count = sum(best[1] for best in bests)
+            weight_sum = sum(best[2] for best in bests)
+            return solution, count, weight_sum
+
+        solution, count, weight_sum = combined()
+        yield solution, count, weight_sum
+        self.current_min_count = count
+        self.current_min_weight_sum = weight_sum
+        self.current_solution = list(solution)
+        for component_index, stream in enumerate(streams):
+            for better in stream:
+                bests[component_index] = better
+                solution, count, weight_sum = combined()
+                yield solution, count, weight_sum
+                self.current_min_count = count
+                self.current_min_weight_sum = weight_sum
+                self.current_solution = list(solution)
+
+    def _greedy_cover(self):
+        """build a vertex cover greedily (highest alive degree first, lightest
+        weight on ties). not optimal, but a tight enough upper bound to prune
+        most of the search tree from iteration 0"""
+        indptr = self._indptr
+        indices = self._indices
+        n = len(indptr) - 1
+        degrees = [indptr[rank + 1] - indptr[rank] for rank in range(n)]
+        removed_mask = 0
+        remaining_edges = self._edge_count
+        cover = []
+        weight_sum = 0
+        while remaining_edges:
+            best_rank = max(
+                (rank for rank in range(n) if degrees[rank] and not (removed_mask >> rank) & 1),
+                key=lambda rank: (degrees[rank], -self._rank_weights[rank])
+            )
+            cover.append(self.search_order[best_rank])
+            weight_sum += self._rank_weights[best_rank]
+            removed_mask |= 1 << best_rank
+            remaining_edges -= degrees[best_rank]
+            for k in range(indptr[best_rank], indptr[best_rank + 1]):
+                neighbor = indices[k]
+                if not (removed_mask >> neighbor) & 1:
+                    degrees[neighbor] -= 1
+            degrees[best_rank] = 0
+        return cover, len(cover), weight_sum
+
+    def _search_streamed(self):
+        """thin wrapper around the kernel builds: picks the compiled Cython
+        kernel, then the numba build, then the popcount bitmask build, and
+        translates the yielded bitmasks back into node lists"""
+        search_order = self.search_order
+        n = len(search_order)
+        if _mvc_core is not None and n <= 256:
+            # C kernel over fixed uint64[4] masks: a generator with the same
+            # pruning rules as the bitmask build, so improving covers stream
+            # out exactly as they do from the Python kernels (weights travel
+            # as doubles)
+            stream = _mvc_core.search_mvc(self._indptr, self._indices,
+                                          array('d', self._rank_weights),
+                                          self._edge_count,
+                                          float(self.current_min_count),
+                                          float(self.current_min_weight_sum),
+                                          self._weight_is_constant)
+        elif _search_core_jit is not None and n <= 63:
+            # numba ships with numpy; hand the kernel numpy views so it
+            # compiles. asarray keeps the array('l') item size, whatever C
+            # long is on this platform, and numba specializes on the
+            # resulting dtype. beyond 63 bits the mask needs a Python
+            # bigint, which only the interpreter builds can handle
+            import numpy
+            stream = _search_core_jit(numpy.asarray(self._indptr),
+                                      numpy.asarray(self._indices),
+                                      numpy.asarray(self._rank_weights, dtype=numpy.float64),
+                                      self._edge_count,
+                                      self.current_min_count, self.current_min_weight_sum,
+                                      self._weight_is_constant)
+        else:
+            stream = _search_core_masks(self._adj_masks, self._rank_weights, self._edge_count,
+                                        self.current_min_count, self.current_min_weight_sum,
+                                        self._weight_is_constant)
+        for picked_mask, count, weight_sum in stream:
+            # picks happen in increasing rank order, so expanding the mask in
+            # rank order reproduces the selection order. this is the only
+            # point where a solution list is materialized: inside the kernels
+            # a partial cover is just an int mask, never a copied list
+            solution = [search_order[rank] for rank in range(n) if (picked_mask >> rank) & 1]
+            yield solution, count, weight_sum
             # yield first so at that time we can compare between previous solution and current solution conveniently
-            self.current_min_weight_sum = current_sum
-            self.current_min_count = current_count
-            self.current_solution = selected_solution
-            return
-        
-        if current_decision_index >= len(self.original_graph):  # self.original_graph might be None, but it is a private method. it is protected by create_graph_max_degree_first_then_min_weight_first which always returns a result
-            # we can't find a solution, all index used.
-            return
-        picked_node = self.search_order[current_decision_index]
-        if picked_node in current_graph: # try delete first to get (greedy) solution quickly. pruning happens inside
-            # print(f"decide to delete {current_decision_index}th node",picked_node) # TODO: remove debugging code
-            yield from self._search_streamed(current_decision_index + 1, selected_solution + [picked_node], delete_node(current_graph, picked_node))
-        
-        yield from self._search_streamed(current_decision_index + 1, selected_solution, current_graph)
+            self.current_min_weight_sum = weight_sum
+            self.current_min_count = count
+            # keep a private copy so callers may mutate the yielded list freely
+            self.current_solution = list(solution)
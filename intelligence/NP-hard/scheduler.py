@@ -1,16 +1,61 @@
 import multiprocessing as mp
 import queue
+import struct
+import threading
 import time
-from typing import Any, Generator, Iterator
+from multiprocessing import shared_memory
+from typing import Any, Generator, Iterator, Optional
+
+# fixed-width record for the shared-memory ring: status, count, weight_sum,
+# cover length, then the cover itself as int64 slots. status codes below.
+_RECORD_ITEM = 0
+_RECORD_DONE = 1
+_RECORD_ERROR = 2
+
+def _record_struct(max_cover_len: int) -> struct.Struct:
+    return struct.Struct(f'<iidi{max_cover_len}q')
 
 class TimeoutException(Exception):
     """Exception raised when a generator times out"""
     pass
 
-def _generator_worker(generator: Iterator[Any], output_queue: mp.Queue, done_event: mp.Event) -> None:
+class CancellationToken:
+    """Cooperative stop flag shared with an in-process generator.
+
+    A thread cannot be terminated the way a process can, so generators run
+    through timeout_wrapper_thread should check `token.cancelled` between
+    yields and return early once it is set.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+def _acquire_credit(credit_queue, done_event) -> bool:
+    """Block until the consumer grants a credit, giving up once done_event is
+    set so a producer waiting for credits cannot outlive its consumer"""
+    while not done_event.is_set():
+        try:
+            credit_queue.get(timeout=0.1)
+            return True
+        except queue.Empty:
+            continue
+    return False
+
+def _generator_worker(generator: Iterator[Any], output_queue: mp.Queue, done_event: mp.Event, credit_queue=None) -> None:
     """Worker function that runs the generator in a separate process"""
     try:
         for item in generator:
+            # credit-based backpressure: the consumer grants one credit per
+            # item it is willing to buffer, so a fast generator can never
+            # run further than `prefetch` items ahead of the consumer
+            if credit_queue is not None and not _acquire_credit(credit_queue, done_event):
+                break
             if done_event.is_set():
                 break
             output_queue.put(('item', item))
@@ -21,28 +66,213 @@ def _generator_worker(generator: Iterator[Any], output_queue: mp.Queue, done_eve
         # Signal that we're done
         output_queue.put(('finished', None))
 
-def timeout_wrapper(generator: Generator[Any, None, None], timeout_seconds: float, quiet: bool = False) -> Generator[Any, None, None]:
+def _acquire_semaphore(semaphore, done_event) -> bool:
+    """Block on a ring-buffer semaphore, giving up once done_event is set"""
+    while not done_event.is_set():
+        if semaphore.acquire(timeout=0.1):
+            return True
+    return False
+
+def _generator_worker_shm(generator: Iterator[Any], shm_name: str, slots: int, max_cover_len: int,
+                          free_slots, ready_slots, done_event: mp.Event, error_queue: mp.Queue) -> None:
+    """Worker that streams (cover, count, weight_sum) records through a
+    shared-memory ring buffer instead of pickling them onto a queue"""
+    record = _record_struct(max_cover_len)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    write_index = 0
+
+    def write(status, count=0, weight_sum=0.0, cover=()):
+        nonlocal write_index
+        if not _acquire_semaphore(free_slots, done_event):
+            return False
+        offset = (write_index % slots) * record.size
+        padded = list(cover) + [0] * (max_cover_len - len(cover))
+        record.pack_into(shm.buf, offset, status, count, weight_sum, len(cover), *padded)
+        write_index += 1
+        ready_slots.release()
+        return True
+
+    try:
+        for cover, count, weight_sum in generator:
+            if done_event.is_set():
+                break
+            if not write(_RECORD_ITEM, count, weight_sum, cover):
+                break
+        else:
+            write(_RECORD_DONE)
+    except Exception as e:
+        error_queue.put(e)
+        write(_RECORD_ERROR)
+    finally:
+        shm.close()
+
+def _timeout_wrapper_shm(generator: Generator[Any, None, None], timeout_seconds: float, quiet: bool,
+                         prefetch: int, max_cover_len: int) -> Generator[Any, None, None]:
+    """Ring-buffer build of timeout_wrapper: see timeout_wrapper for the contract"""
+    record = _record_struct(max_cover_len)
+    slots = prefetch + 2  # slack for the done/error sentinel records
+    shm = shared_memory.SharedMemory(create=True, size=record.size * slots)
+    free_slots = mp.Semaphore(slots)
+    ready_slots = mp.Semaphore(0)
+    done_event = mp.Event()
+    error_queue = mp.Queue()
+
+    process = mp.Process(
+        target=_generator_worker_shm,
+        args=(generator, shm.name, slots, max_cover_len, free_slots, ready_slots, done_event, error_queue),
+        daemon=True
+    )
+    process.start()
+
+    read_index = 0
+    try:
+        while True:
+            if not ready_slots.acquire(timeout=timeout_seconds):
+                # Timeout occurred
+                if quiet:
+                    break
+                else:
+                    raise TimeoutException(f"Generator timed out after {timeout_seconds} seconds")
+            offset = (read_index % slots) * record.size
+            unpacked = record.unpack_from(shm.buf, offset)
+            status, count, weight_sum, cover_len = unpacked[:4]
+            cover = list(unpacked[4:4 + cover_len])
+            read_index += 1
+            free_slots.release()
+            if status == _RECORD_ITEM:
+                yield cover, count, weight_sum
+            elif status == _RECORD_DONE:
+                break
+            elif status == _RECORD_ERROR:
+                raise error_queue.get()
+    finally:
+        done_event.set()
+        process.terminate()
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.kill()
+        shm.close()
+        shm.unlink()
+
+def timeout_wrapper_thread(generator: Generator[Any, None, None], timeout_seconds: float, quiet: bool = False,
+                           prefetch: int = 2,
+                           cancellation_token: Optional[CancellationToken] = None) -> Generator[Any, None, None]:
+    """
+    Wrap a generator with timeout functionality, running it in a daemon
+    thread instead of a separate process.
+
+    Compared to timeout_wrapper this skips the pickle round-trip per yielded
+    item (MVC solutions are whole lists of ints, yielded many times) and the
+    process start cost, but there is no hard `.terminate()`: on timeout the
+    wrapper sets its stop flags and returns, and the generator only actually
+    stops the next time it yields or checks the cancellation token. Use this
+    when a timeout is all you need; keep timeout_wrapper for true isolation.
+
+    Args:
+        generator: The generator to wrap
+        timeout_seconds: Timeout in seconds for each next() call
+        quiet: If True, stop iteration on timeout; if False, raise TimeoutException
+        prefetch: How many items the worker may produce ahead of the consumer.
+            In-process the bounded queue's blocking put() is all the
+            backpressure needed, so there is no credit queue here
+        cancellation_token: Optional CancellationToken the generator checks
+            between steps for cooperative early exit
+
+    Yields:
+        Items from the wrapped generator
+
+    Raises:
+        TimeoutException: If timeout occurs and quiet=False
+    """
+    # +2 leaves slack for the 'done'/'finished' sentinels, as in
+    # timeout_wrapper
+    output_queue = queue.Queue(maxsize=prefetch + 2)
+    done_event = threading.Event()
+
+    # the worker only needs put()/is_set(), so the process worker runs
+    # unchanged on a thread-side queue and event
+    thread = threading.Thread(
+        target=_generator_worker,
+        args=(generator, output_queue, done_event),
+        daemon=True
+    )
+    thread.start()
+
+    try:
+        while thread.is_alive() or not output_queue.empty():
+            try:
+                msg_type, content = output_queue.get(timeout=timeout_seconds)
+
+                if msg_type == 'item':
+                    yield content
+                elif msg_type == 'done':
+                    break
+                elif msg_type == 'error':
+                    raise content
+                elif msg_type == 'finished':
+                    break
+
+            except queue.Empty:
+                # Timeout occurred
+                if quiet:
+                    break
+                else:
+                    raise TimeoutException(f"Generator timed out after {timeout_seconds} seconds")
+
+    finally:
+        # Cooperative shutdown: the generator sees these the next time it
+        # yields (worker checks done_event) or checks the token itself
+        done_event.set()
+        if cancellation_token is not None:
+            cancellation_token.cancel()
+        # drain the bounded queue so a worker blocked in put() wakes up and
+        # sees the stop flag
+        while not output_queue.empty():
+            try:
+                output_queue.get_nowait()
+            except queue.Empty:
+                break
+        thread.join(timeout=1.0)
+
+def timeout_wrapper(generator: Generator[Any, None, None], timeout_seconds: float, quiet: bool = False, prefetch: int = 2,
+                    max_cover_len: Optional[int] = None) -> Generator[Any, None, None]:
     """
     Wrap a generator with timeout functionality.
-    
+
     Args:
         generator: The generator to wrap
         timeout_seconds: Timeout in seconds for each next() call
         quiet: If True, stop iteration on timeout; if False, raise TimeoutException
-    
+        prefetch: How many items the worker may produce ahead of the consumer.
+            Bounds peak memory to roughly prefetch * item size instead of
+            letting a fast generator fill RAM through an unbounded queue
+        max_cover_len: If set, the generator must yield progressive-solver
+            records (cover, count, weight_sum) with at most this many cover
+            entries, and they cross process boundaries through a
+            shared-memory ring buffer as fixed-width structs instead of
+            being pickled onto the queue (weight_sum travels as a double)
+
     Yields:
         Items from the wrapped generator
-    
+
     Raises:
         TimeoutException: If timeout occurs and quiet=False
     """
-    output_queue = mp.Queue()
+    if max_cover_len is not None:
+        yield from _timeout_wrapper_shm(generator, timeout_seconds, quiet, prefetch, max_cover_len)
+        return
+    # +2 leaves slack for the 'done'/'finished' sentinels, which are sent
+    # without consuming a credit
+    output_queue = mp.Queue(maxsize=prefetch + 2)
+    credit_queue = mp.Queue()
     done_event = mp.Event()
-    
+    for _ in range(prefetch):
+        credit_queue.put(None)
+
     # Start the generator in a separate process
     process = mp.Process(
         target=_generator_worker,
-        args=(generator, output_queue, done_event),
+        args=(generator, output_queue, done_event, credit_queue),
         daemon=True
     )
     process.start()
@@ -55,13 +285,14 @@ def timeout_wrapper(generator: Generator[Any, None, None], timeout_seconds: floa
                 
                 if msg_type == 'item':
                     yield content
+                    credit_queue.put(None)  # grant the worker one more slot
                 elif msg_type == 'done':
                     break
                 elif msg_type == 'error':
                     raise content
                 elif msg_type == 'finished':
                     break
-                    
+
             except queue.Empty:
                 # Timeout occurred
                 if quiet:
@@ -77,9 +308,10 @@ def timeout_wrapper(generator: Generator[Any, None, None], timeout_seconds: floa
         if process.is_alive():
             process.kill()
         
-        # Clean up the queue
-        while not output_queue.empty():
-            try:
-                output_queue.get_nowait()
-            except queue.Empty:
-                break
\ No newline at end of file
+        # Clean up the queues
+        for q in (output_queue, credit_queue):
+            while not q.empty():
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""Build the optional C extension kernel for minimum_vertex_cover:
+
+    python setup_mvc_core.py build_ext --inplace
+
+Requires Cython; everything keeps working on the pure-Python kernels when
+the extension has not been built.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='mvc-core',
+    ext_modules=cythonize('_mvc_core.pyx', language_level=3),
+)